@@ -166,7 +166,7 @@ def get_all_orbits():
     try:
         num_points = int(request.args.get('points', 360))
         
-        orbits = orbital_calc.get_all_orbits(num_points)
+        orbits = get_calculator().get_all_orbits(num_points)
         
         return jsonify({
             'success': True,
@@ -193,7 +193,7 @@ def get_asteroid_orbit(asteroid_name):
     try:
         num_points = int(request.args.get('points', 360))
         
-        orbit = orbital_calc.get_asteroid_orbit(asteroid_name, num_points)
+        orbit = get_calculator().get_asteroid_orbit(asteroid_name, num_points)
         
         if orbit is None:
             return jsonify({
@@ -221,7 +221,7 @@ def get_pha_orbits():
     try:
         num_points = int(request.args.get('points', 360))
         
-        pha_orbits = orbital_calc.get_pha_orbits(num_points)
+        pha_orbits = get_calculator().get_pha_orbits(num_points)
         
         return jsonify({
             'success': True,
@@ -245,7 +245,7 @@ def get_asteroid_list():
                 'name': data['name'],
                 'pha': data['pha']
             }
-            for name, data in orbital_calc.asteroids.items()
+            for name, data in get_calculator().asteroids.items()
         ]
         
         return jsonify({
@@ -0,0 +1,10 @@
+"""
+Pytest configuration for the backend
+
+The backend modules import each other by bare name (as when running
+app.py from this directory), so make this directory importable.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
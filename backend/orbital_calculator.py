@@ -6,6 +6,8 @@ import numpy as np
 import pandas as pd
 import os
 
+from shared_catalog import SharedCatalog
+
 class OrbitalCalculator:
     """Calculate 3D orbital trajectories from Keplerian elements"""
     
@@ -40,6 +42,32 @@ class OrbitalCalculator:
                 'peri': float(row['peri'])  # argument of perihelion (degrees)
             }
     
+    @property
+    def asteroids(self):
+        """Loaded asteroids keyed by designation"""
+        return self._catalog[0]
+
+    @asteroids.setter
+    def asteroids(self, asteroids):
+        self._catalog = (asteroids, None)
+
+    @property
+    def shared(self):
+        """Attached shared_catalog.SharedCatalog, or None when loaded from CSV"""
+        return self._catalog[1]
+
+    def attach_shared(self, catalog):
+        """
+        Serve asteroids and trajectories from a shared-memory catalog
+
+        Args:
+            catalog: shared_catalog.SharedCatalog attached by this worker
+        """
+        # Swapped in one assignment so concurrent requests see either the old
+        # or the new version, never a mix. The old version is detached once
+        # in-flight requests drop it.
+        self._catalog = (catalog.asteroids, catalog)
+    
     @staticmethod
     def calculate_orbit_point(a, e, i, node, peri, theta):
         """
@@ -127,18 +155,36 @@ class OrbitalCalculator:
         Returns:
             dict: Orbital data with trajectory points
         """
-        if name not in self.asteroids:
+        asteroids, shared = self._catalog
+        if name not in asteroids:
             return None
         
-        asteroid = self.asteroids[name]
-        orbit = self.calculate_full_orbit(
-            asteroid['a'],
-            asteroid['e'],
-            asteroid['i'],
-            asteroid['node'],
-            asteroid['peri'],
-            num_points
-        )
+        return self._build_orbit(asteroids[name], shared, num_points)
+    
+    def _build_orbit(self, asteroid, shared, num_points):
+        """
+        Build orbital data for one asteroid from a single catalog snapshot
+        
+        Args:
+            asteroid: Orbital element dict
+            shared: SharedCatalog the asteroid came from, or None
+            num_points: Number of points to calculate
+        
+        Returns:
+            dict: Orbital data with trajectory points
+        """
+        if shared is not None and shared.num_points == num_points:
+            # Precomputed by the loader; no per-worker recomputation
+            orbit = shared.trajectory(asteroid['name'])
+        else:
+            orbit = self.calculate_full_orbit(
+                asteroid['a'],
+                asteroid['e'],
+                asteroid['i'],
+                asteroid['node'],
+                asteroid['peri'],
+                num_points
+            )
         
         return {
             'name': asteroid['name'],
@@ -163,9 +209,10 @@ class OrbitalCalculator:
         Returns:
             list: List of orbital data dictionaries
         """
+        asteroids, shared = self._catalog
         return [
-            self.get_asteroid_orbit(name, num_points)
-            for name in self.asteroids.keys()
+            self._build_orbit(asteroid, shared, num_points)
+            for asteroid in asteroids.values()
         ]
     
     def get_pha_orbits(self, num_points=360):
@@ -178,10 +225,11 @@ class OrbitalCalculator:
         Returns:
             list: List of PHA orbital data dictionaries
         """
+        asteroids, shared = self._catalog
         return [
-            self.get_asteroid_orbit(name, num_points)
-            for name, data in self.asteroids.items()
-            if data['pha']
+            self._build_orbit(asteroid, shared, num_points)
+            for asteroid in asteroids.values()
+            if asteroid['pha']
         ]
     
     def create_trajectory_summary_csv(self, output_path):
@@ -224,9 +272,24 @@ class OrbitalCalculator:
 _calculator = None
 
 def get_calculator():
-    """Get or create the global orbital calculator instance"""
+    """
+    Get or create the global orbital calculator instance
+
+    If METEOR_SHARED_CATALOG is set, the catalog is attached from shared
+    memory published by shared_catalog.py instead of loaded from CSV, and
+    re-attached whenever the loader publishes a new version.
+    """
     global _calculator
+    shared_prefix = os.environ.get('METEOR_SHARED_CATALOG')
     if _calculator is None:
-        csv_path = os.path.join(os.path.dirname(__file__), 'asteroid_data.csv')
-        _calculator = OrbitalCalculator(csv_path)
+        if shared_prefix:
+            _calculator = OrbitalCalculator()
+            _calculator.attach_shared(SharedCatalog.attach(shared_prefix))
+        else:
+            csv_path = os.path.join(os.path.dirname(__file__), 'asteroid_data.csv')
+            _calculator = OrbitalCalculator(csv_path)
+    else:
+        shared = _calculator.shared
+        if shared is not None and shared.is_stale():
+            _calculator.attach_shared(shared.reattach())
     return _calculator
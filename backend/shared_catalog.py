@@ -0,0 +1,491 @@
+"""
+Shared-memory asteroid catalog for multi-worker deployments
+
+A single loader process packs the orbital elements and precomputed trajectory
+buffers into POSIX shared memory. Every worker attaches to the same segment
+read-only, so memory stays flat no matter how many workers are running.
+
+Segments:
+    <prefix>_ctl      control block holding the currently published version
+                      and its generation (a random token per publish)
+    <prefix>_v<N>     catalog data for version N (header, elements, PHA flags,
+                      names, trajectories)
+
+Reloads publish version N+1 into a fresh segment and then bump the control
+block. Workers notice the new generation and re-attach; the old segment is
+unlinked right away but stays mapped for workers still reading it. Because
+generations are random, a restarted loader that counts versions from 1 again
+is still seen as new.
+
+Run as a standalone loader (POSIX only):
+    python shared_catalog.py            # publish, reload on SIGHUP
+    METEOR_SHARED_CATALOG=meteor_catalog python app.py
+"""
+import atexit
+import mmap
+import os
+import secrets
+import signal
+import threading
+import time
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    import _posixshmem
+except ImportError:  # Windows: the CSV path still works, shared mode does not
+    _posixshmem = None
+
+DEFAULT_PREFIX = 'meteor_catalog'
+DEFAULT_NUM_POINTS = 360
+
+_MAGIC = 0x4D4554454F52  # "METEOR"
+_CTL_SLOTS = 3           # magic, version, generation
+_HEADER_SLOTS = 6        # magic, version, generation, count, num_points, name_width
+_ELEMENT_KEYS = ('a', 'e', 'i', 'node', 'peri')
+
+# How often a worker whose loader has shut down looks for a new one (seconds)
+_CTL_REOPEN_INTERVAL = 1.0
+
+
+def _align(offset, alignment=8):
+    """Round offset up to the next multiple of alignment"""
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _layout(count, num_points, name_width):
+    """
+    Compute byte offsets of each array inside a catalog segment
+
+    Returns:
+        tuple: (offsets dict, total size in bytes)
+    """
+    offsets = {}
+    offset = _HEADER_SLOTS * 8
+
+    offsets['elements'] = offset
+    offset = _align(offset + count * len(_ELEMENT_KEYS) * 8)
+
+    offsets['pha'] = offset
+    offset = _align(offset + count)
+
+    offsets['names'] = offset
+    offset = _align(offset + count * name_width * 4)  # numpy 'U' is UCS-4
+
+    offsets['trajectories'] = offset
+    offset = _align(offset + count * 3 * num_points * 8)
+
+    return offsets, max(offset, 1)
+
+
+def _map_readonly(name):
+    """
+    Map an existing segment read-only (worker side)
+
+    Workers deliberately bypass SharedMemory: it always maps read-write and,
+    on Python < 3.13, registers the segment with the resource tracker, which
+    would unlink it when the worker exits. A plain PROT_READ mapping does
+    neither, and numpy arrays built on it keep the mapping alive for as long
+    as they are referenced.
+
+    Raises:
+        FileNotFoundError: If the segment does not exist
+        OSError: If the platform has no POSIX shared memory
+    """
+    if _posixshmem is None:
+        raise OSError("Shared catalog requires a POSIX system (Linux/macOS)")
+    # Same primitive SharedMemory uses; os has no shm_open of its own
+    fd = _posixshmem.shm_open('/' + name, os.O_RDONLY, mode=0o600)
+    try:
+        return mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+    finally:
+        os.close(fd)
+
+
+def _unlink_segment(shm):
+    """Close and unlink a segment owned by the loader"""
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _unlink_name(name):
+    """Unlink a segment by name if it exists"""
+    try:
+        _unlink_segment(shared_memory.SharedMemory(name=name))
+    except FileNotFoundError:
+        pass
+
+
+def _segment_name(prefix, version):
+    return f"{prefix}_v{version}"
+
+
+def _new_generation():
+    """Random token identifying one publish, unique across loader restarts"""
+    return secrets.randbits(63) or 1
+
+
+def _views(buf, count, num_points, name_width):
+    """Build numpy views over a catalog segment buffer"""
+    offsets, _ = _layout(count, num_points, name_width)
+    return {
+        'elements': np.ndarray((count, len(_ELEMENT_KEYS)), dtype=np.float64,
+                               buffer=buf, offset=offsets['elements']),
+        'pha': np.ndarray((count,), dtype=np.bool_,
+                          buffer=buf, offset=offsets['pha']),
+        'names': np.ndarray((count,), dtype=f'U{name_width}',
+                            buffer=buf, offset=offsets['names']),
+        'trajectories': np.ndarray((count, 3, num_points), dtype=np.float64,
+                                   buffer=buf, offset=offsets['trajectories']),
+    }
+
+
+class _ControlBlock:
+    """
+    Worker-side mapping of a loader's control segment
+
+    Stays mapped so checking for a new version is a plain memory read. A loader
+    that shuts down retires its block; workers then look for a replacement at
+    most once every _CTL_REOPEN_INTERVAL seconds.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._slots = None
+        self._reopen_at = 0.0
+        self._lock = threading.Lock()
+
+    def read(self):
+        """
+        Read the currently published version
+
+        Returns:
+            tuple: (version, generation), or None if nothing is published
+        """
+        with self._lock:
+            if self._slots is None or self._slots[0] != _MAGIC:
+                if time.monotonic() < self._reopen_at:
+                    return None
+                self._reopen()
+                if self._slots is None or self._slots[0] != _MAGIC:
+                    self._reopen_at = time.monotonic() + _CTL_REOPEN_INTERVAL
+                    return None
+            return int(self._slots[1]), int(self._slots[2])
+
+    def _reopen(self):
+        # Dropping the old slots releases the old mapping
+        self._slots = None
+        try:
+            mapping = _map_readonly(f"{self.prefix}_ctl")
+        except FileNotFoundError:
+            return
+        self._slots = np.ndarray((_CTL_SLOTS,), dtype=np.int64, buffer=mapping)
+
+
+class SharedAsteroidView(Mapping):
+    """
+    Read-only dict-like view of the shared catalog
+
+    Behaves like OrbitalCalculator.asteroids (name -> element dict) but reads
+    values straight from shared memory instead of holding a private copy.
+    """
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __getitem__(self, name):
+        return self._catalog.asteroid(name)
+
+    def __iter__(self):
+        return iter(self._catalog._index)
+
+    def __len__(self):
+        return len(self._catalog._index)
+
+    def __contains__(self, name):
+        return name in self._catalog._index
+
+
+class SharedCatalog:
+    """
+    Read-only, zero-copy attachment to a published catalog version
+
+    The arrays are views on a read-only mapping of the loader's segment; they
+    stay valid for as long as they are referenced, even after a reload or
+    close().
+    """
+
+    def __init__(self, mapping, control, version, generation, count, num_points, name_width):
+        self._control = control
+        self.prefix = control.prefix
+        self.version = version
+        self.generation = generation
+        self.num_points = num_points
+
+        views = _views(mapping, count, num_points, name_width)
+        self.elements = views['elements']
+        self.pha = views['pha']
+        self.names = views['names']
+        self.trajectories = views['trajectories']
+        self._index = {str(name): row for row, name in enumerate(self.names)}
+
+    @property
+    def asteroids(self):
+        """Dict-like name -> element view, same shape as OrbitalCalculator.asteroids"""
+        return SharedAsteroidView(self)
+
+    @classmethod
+    def attach(cls, prefix=DEFAULT_PREFIX, retries=5, control=None):
+        """
+        Attach to the latest published catalog
+
+        Args:
+            prefix: Shared memory name prefix used by the loader
+            retries: Attempts if a reload swaps segments mid-attach
+            control: Already mapped control block to reuse
+
+        Returns:
+            SharedCatalog: Attached catalog
+
+        Raises:
+            FileNotFoundError: If no consistent catalog has been published
+        """
+        control = control or _ControlBlock(prefix)
+        for _ in range(retries):
+            published = control.read()
+            if published is None:
+                raise FileNotFoundError(f"No shared catalog published under '{control.prefix}'")
+            version, generation = published
+            try:
+                mapping = _map_readonly(_segment_name(control.prefix, version))
+            except FileNotFoundError:
+                # Loader swapped versions between reading ctl and attaching
+                time.sleep(0.01)
+                continue
+
+            if len(mapping) >= _HEADER_SLOTS * 8:
+                header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=mapping)
+                magic, _, seg_generation, count, num_points, name_width = (int(v) for v in header)
+                del header
+                # Segment from another publish (reload or loader restart in
+                # progress) or a header that does not fit the segment
+                if (magic == _MAGIC and seg_generation == generation
+                        and count >= 0 and num_points > 0 and name_width > 0
+                        and _layout(count, num_points, name_width)[1] <= len(mapping)):
+                    return cls(mapping, control, version, generation, count, num_points, name_width)
+            mapping.close()
+            time.sleep(0.01)
+
+        raise FileNotFoundError(f"No consistent shared catalog under '{control.prefix}'")
+
+    def reattach(self):
+        """Attach to the latest published version, reusing this control mapping"""
+        return SharedCatalog.attach(control=self._control)
+
+    def is_stale(self):
+        """
+        Check whether the loader has published a newer version
+
+        If the loader has gone away, the current attachment stays valid.
+        """
+        published = self._control.read()
+        return published is not None and published[1] != self.generation
+
+    def asteroid(self, name):
+        """
+        Get the orbital elements of an asteroid
+
+        Raises:
+            KeyError: If the asteroid is not in the catalog
+        """
+        row = self._index[name]
+        asteroid = {'name': name, 'pha': bool(self.pha[row])}
+        for key, value in zip(_ELEMENT_KEYS, self.elements[row]):
+            asteroid[key] = float(value)
+        return asteroid
+
+    def trajectory(self, name):
+        """
+        Get the precomputed trajectory for an asteroid
+
+        Returns:
+            dict: {'x': [...], 'y': [...], 'z': [...]}
+        """
+        X, Y, Z = self.trajectories[self._index[name]]
+        return {'x': X.tolist(), 'y': Y.tolist(), 'z': Z.tolist()}
+
+    def close(self):
+        """
+        Drop this catalog's references to shared memory
+
+        The mapping is released once no array taken from it is referenced.
+        Does not unlink the segment.
+        """
+        self.elements = self.pha = self.names = self.trajectories = None
+        self._index = {}
+
+
+class SharedCatalogPublisher:
+    """Owns the shared catalog segments; run in exactly one loader process"""
+
+    def __init__(self, prefix=DEFAULT_PREFIX):
+        self.prefix = prefix
+        self.version = 0
+        self.generation = 0
+        self._segment = None
+
+        try:
+            self._ctl = shared_memory.SharedMemory(
+                name=f"{prefix}_ctl", create=True, size=_CTL_SLOTS * 8)
+        except FileExistsError:
+            # Left behind by a loader that crashed; take it over
+            self._ctl = shared_memory.SharedMemory(name=f"{prefix}_ctl")
+        self._ctl_slots = np.ndarray((_CTL_SLOTS,), dtype=np.int64, buffer=self._ctl.buf)
+        if self._ctl_slots[0] == _MAGIC:
+            self.version = int(self._ctl_slots[1])
+            self.generation = int(self._ctl_slots[2])
+            # Drop the crashed loader's data; attached workers keep their mapping
+            _unlink_name(_segment_name(prefix, self.version))
+
+        atexit.register(self.close)
+
+    def publish(self, calculator, num_points=DEFAULT_NUM_POINTS):
+        """
+        Publish the calculator's catalog as a new version
+
+        Args:
+            calculator: OrbitalCalculator with asteroids loaded
+            num_points: Number of trajectory points to precompute per asteroid
+
+        Returns:
+            int: The newly published version
+
+        Raises:
+            ValueError: If the calculator has no asteroids loaded
+        """
+        names = list(calculator.asteroids.keys())
+        if not names:
+            raise ValueError("Refusing to publish an empty asteroid catalog")
+        count = len(names)
+        name_width = max(len(name) for name in names)
+
+        # Build everything before touching shared memory so a bad row cannot leak a segment
+        elements = np.empty((count, len(_ELEMENT_KEYS)), dtype=np.float64)
+        pha = np.empty(count, dtype=np.bool_)
+        trajectories = np.empty((count, 3, num_points), dtype=np.float64)
+        for row, name in enumerate(names):
+            asteroid = calculator.asteroids[name]
+            elements[row] = [asteroid[key] for key in _ELEMENT_KEYS]
+            pha[row] = asteroid['pha']
+            orbit = calculator.calculate_full_orbit(*elements[row], num_points)
+            trajectories[row] = (orbit['x'], orbit['y'], orbit['z'])
+
+        version = self.version + 1
+        generation = _new_generation()
+        _, size = _layout(count, num_points, name_width)
+        segment_name = _segment_name(self.prefix, version)
+        try:
+            segment = shared_memory.SharedMemory(name=segment_name, create=True, size=size)
+        except FileExistsError:
+            _unlink_name(segment_name)
+            segment = shared_memory.SharedMemory(name=segment_name, create=True, size=size)
+
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=segment.buf)
+        views = _views(segment.buf, count, num_points, name_width)
+        views['elements'][:] = elements
+        views['pha'][:] = pha
+        views['names'][:] = names
+        views['trajectories'][:] = trajectories
+        header[:] = (_MAGIC, version, generation, count, num_points, name_width)
+        del header, views
+
+        # Hand off: workers compare the generation, so it is written last
+        self._ctl_slots[1] = version
+        self._ctl_slots[2] = generation
+        self._ctl_slots[0] = _MAGIC
+
+        previous = self._segment
+        self._segment = segment
+        self.version = version
+        self.generation = generation
+        if previous is not None:
+            _unlink_segment(previous)
+
+        return version
+
+    def close(self):
+        """Unlink all segments owned by this loader"""
+        if self._ctl is None:
+            return
+        if self._segment is not None:
+            _unlink_segment(self._segment)
+            self._segment = None
+        # Retire the control block so attached workers look for the next loader
+        self._ctl_slots[0] = 0
+        self._ctl_slots = None
+        _unlink_segment(self._ctl)
+        self._ctl = None
+
+
+def _load_catalog(csv_path):
+    """
+    Load the asteroid CSV for publishing
+
+    Raises:
+        FileNotFoundError: If the CSV is missing
+        ValueError: If the CSV has no asteroids
+    """
+    from orbital_calculator import OrbitalCalculator
+
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Asteroid data not found: {csv_path}")
+    calculator = OrbitalCalculator(csv_path)
+    if not calculator.asteroids:
+        raise ValueError(f"No asteroids found in {csv_path}")
+    return calculator
+
+
+def main():
+    if not hasattr(signal, 'SIGHUP'):
+        raise SystemExit("❌ The shared catalog loader requires a POSIX system (Linux/macOS)")
+
+    prefix = os.environ.get('METEOR_SHARED_CATALOG', DEFAULT_PREFIX)
+    csv_path = os.path.join(os.path.dirname(__file__), 'asteroid_data.csv')
+    publisher = SharedCatalogPublisher(prefix)
+
+    def publish():
+        version = publisher.publish(_load_catalog(csv_path))
+        print(f"✅ Published shared catalog '{prefix}' version {version}")
+
+    def reload(*_):
+        try:
+            publish()
+        except Exception as e:
+            print(f"❌ Reload failed, still serving version {publisher.version}: {e}")
+
+    def shutdown(*_):
+        publisher.close()
+        raise SystemExit(0)
+
+    try:
+        publish()
+    except Exception as e:
+        publisher.close()
+        raise SystemExit(f"❌ Could not publish shared catalog: {e}")
+    signal.signal(signal.SIGHUP, reload)
+    signal.signal(signal.SIGTERM, shutdown)
+    print("🔁 Send SIGHUP to reload asteroid_data.csv, SIGTERM/Ctrl+C to stop")
+    try:
+        while True:
+            signal.pause()
+    except KeyboardInterrupt:
+        publisher.close()
+
+
+if __name__ == '__main__':
+    main()
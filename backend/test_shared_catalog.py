@@ -0,0 +1,220 @@
+"""
+Tests for the shared-memory asteroid catalog
+"""
+import atexit
+import gc
+import os
+import signal
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+import orbital_calculator
+from orbital_calculator import OrbitalCalculator, get_calculator
+from shared_catalog import SharedCatalog, SharedCatalogPublisher
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(BACKEND_DIR, 'asteroid_data.csv')
+SHM_DIR = '/dev/shm'
+
+# Answers each stdin line with the attached version and asteroid count
+WORKER = """
+import sys
+from orbital_calculator import get_calculator
+for _ in sys.stdin:
+    calculator = get_calculator()
+    print(calculator.shared.version, len(calculator.asteroids), flush=True)
+"""
+
+
+def segments(prefix):
+    """Names of shared memory segments under prefix still present"""
+    return sorted(name for name in os.listdir(SHM_DIR) if name.startswith(prefix))
+
+
+@pytest.fixture
+def prefix():
+    if not os.path.isdir(SHM_DIR):
+        pytest.skip("requires /dev/shm")
+    prefix = f"mmt_{uuid.uuid4().hex[:8]}"
+    yield prefix
+    for name in segments(prefix):
+        os.unlink(os.path.join(SHM_DIR, name))
+
+
+@pytest.fixture
+def publisher(prefix):
+    publisher = SharedCatalogPublisher(prefix)
+    yield publisher
+    publisher.close()
+
+
+def shared_calculator(prefix):
+    calculator = OrbitalCalculator()
+    calculator.attach_shared(SharedCatalog.attach(prefix))
+    return calculator
+
+
+def test_shared_matches_csv(prefix, publisher):
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    shared = shared_calculator(prefix)
+    reference = OrbitalCalculator(CSV_PATH)
+
+    assert shared.get_asteroid_orbit('99942 Apophis') == reference.get_asteroid_orbit('99942 Apophis')
+    assert shared.get_asteroid_orbit('99942 Apophis', 50) == reference.get_asteroid_orbit('99942 Apophis', 50)
+    assert shared.get_asteroid_orbit('Not An Asteroid') is None
+    assert shared.get_all_orbits() == reference.get_all_orbits()
+    assert shared.get_pha_orbits() == reference.get_pha_orbits()
+
+
+def test_shared_arrays_are_read_only(prefix, publisher):
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    catalog = SharedCatalog.attach(prefix)
+
+    with pytest.raises(ValueError):
+        catalog.elements[0, 0] = 1.0
+    # The mapping itself is read-only, not just the numpy flag
+    with pytest.raises(ValueError):
+        catalog.elements.flags.writeable = True
+
+
+def test_arrays_outlive_reload_and_close(prefix, publisher):
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    calculator = shared_calculator(prefix)
+    trajectory = calculator.shared.trajectories[0]
+    expected = trajectory.copy()
+
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    calculator.attach_shared(calculator.shared.reattach())
+    elements = SharedCatalog.attach(prefix).elements
+    calculator.shared.close()
+    gc.collect()
+
+    assert (trajectory == expected).all()
+    assert elements[0, 0] == 1.458
+
+
+def test_rejects_header_that_does_not_fit(prefix, publisher):
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    header = publisher._segment.buf.cast('q')
+    header[3] = 10 ** 6  # count
+    header.release()
+
+    with pytest.raises(FileNotFoundError):
+        SharedCatalog.attach(prefix, retries=2)
+
+
+def test_reload_is_detected_and_reattached(prefix, publisher, monkeypatch):
+    monkeypatch.setenv('METEOR_SHARED_CATALOG', prefix)
+    monkeypatch.setattr(orbital_calculator, '_calculator', None)
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    calculator = get_calculator()
+    first = calculator.shared
+    assert not first.is_stale()
+
+    reloaded = OrbitalCalculator(CSV_PATH)
+    reloaded.asteroids['433 Eros']['a'] = 9.9
+    publisher.publish(reloaded)
+
+    assert first.is_stale()
+    assert get_calculator() is calculator
+    assert calculator.shared.version == 2
+    assert calculator.get_asteroid_orbit('433 Eros')['orbital_elements']['a'] == 9.9
+    # Requests already holding the old version keep reading it
+    assert first.asteroid('433 Eros')['a'] == 1.458
+
+
+def test_restart_publishes_new_generation(prefix, publisher):
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    worker = SharedCatalog.attach(prefix)
+    publisher.close()
+
+    restarted = SharedCatalogPublisher(prefix)
+    try:
+        reloaded = OrbitalCalculator(CSV_PATH)
+        reloaded.asteroids['433 Eros']['a'] = 9.9
+        assert restarted.publish(reloaded) == worker.version
+
+        assert worker.is_stale()
+        fresh = worker.reattach()
+        assert fresh.generation != worker.generation
+        assert fresh.asteroid('433 Eros')['a'] == 9.9
+    finally:
+        restarted.close()
+
+
+def test_takeover_after_crash_cleans_up(prefix):
+    crashed = SharedCatalogPublisher(prefix)
+    crashed.publish(OrbitalCalculator(CSV_PATH))
+    # Simulate a crash: the loader never gets to clean up
+    atexit.unregister(crashed.close)
+    del crashed
+
+    restarted = SharedCatalogPublisher(prefix)
+    assert restarted.publish(OrbitalCalculator(CSV_PATH)) == 2
+    restarted.close()
+
+    assert segments(prefix) == []
+
+
+def test_close_removes_all_segments(prefix, publisher):
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    publisher.publish(OrbitalCalculator(CSV_PATH))
+    SharedCatalog.attach(prefix)
+    assert segments(prefix) == [f"{prefix}_ctl", f"{prefix}_v2"]
+
+    publisher.close()
+
+    assert segments(prefix) == []
+
+
+def test_refuses_empty_catalog(prefix, publisher):
+    with pytest.raises(ValueError):
+        publisher.publish(OrbitalCalculator())
+
+    assert segments(prefix) == [f"{prefix}_ctl"]
+
+
+def test_loader_and_worker_processes(prefix):
+    env = dict(os.environ, METEOR_SHARED_CATALOG=prefix)
+    count = str(len(OrbitalCalculator(CSV_PATH).asteroids))
+    loader = subprocess.Popen([sys.executable, '-u', 'shared_catalog.py'],
+                              cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True)
+    worker = None
+    try:
+        assert 'version 1' in loader.stdout.readline()
+        loader.stdout.readline()  # reload/stop hint
+
+        worker = subprocess.Popen([sys.executable, '-c', WORKER], cwd=BACKEND_DIR, env=env,
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+        def ask():
+            worker.stdin.write('\n')
+            worker.stdin.flush()
+            return worker.stdout.readline().split()
+
+        assert ask() == ['1', count]
+
+        # A worker exiting must not unlink the loader's segments
+        subprocess.run([sys.executable, '-c', 'from orbital_calculator import get_calculator; get_calculator()'],
+                       cwd=BACKEND_DIR, env=env, check=True)
+        assert segments(prefix) == [f"{prefix}_ctl", f"{prefix}_v1"]
+
+        loader.send_signal(signal.SIGHUP)
+        assert 'version 2' in loader.stdout.readline()
+        assert ask() == ['2', count]
+
+        worker.stdin.close()
+        assert worker.wait(timeout=10) == 0
+        assert segments(prefix) == [f"{prefix}_ctl", f"{prefix}_v2"]
+
+        loader.send_signal(signal.SIGTERM)
+        assert loader.wait(timeout=10) == 0
+        assert segments(prefix) == []
+    finally:
+        for process in (worker, loader):
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()